@@ -1,13 +1,105 @@
-from collections import UserDict
-from datetime import datetime
-from datetime import timedelta
-
-from pickle import load, dump
+from calendar import isleap
+from collections.abc import Iterable, Iterator
+from contextlib import suppress
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+import os
+import re
+import sys
+
+from struct import Struct
+
+# Protocol 5 adds framing for large payloads; I/O goes through a 1 MiB buffer
+PICKLE_PROTOCOL = 5
+BUFFER_SIZE = 1 << 20
+
+# Storage file header: format magic followed by the number of pickled records
+FILE_MAGIC = b"ABK1"
+FILE_HEADER = Struct("<4sI")
+# Classes stored files refer to, under any module name this file ran as
+STORED_CLASSES = frozenset({"AddressBook", "Record", "Name", "Phone", "Birthday"})
+STORED_MODULES = frozenset({"__main__", "models"})
+
+# Reads a record's birthday at C speed, for snapshotting a book's state
+_birthday_of = attrgetter("birthday")
+
+# Exactly 10 ASCII digits; unlike str.isdigit() this rejects other Unicode digits
+_is_phone = re.compile(r"[0-9]{10}").fullmatch
+
+
+@lru_cache(maxsize=4096)
+def _parse_bday(value: str) -> datetime:
+    """
+    Parse a date string the way datetime.strptime(value, "%d.%m.%Y") does.
+
+    The canonical 'DD.MM.YYYY' form is sliced and converted directly, which
+    avoids re-parsing the format string; anything else (e.g. '5.10.2001')
+    is left to strptime.
+
+    Raises:
+        ValueError: If the string is not a valid date.
+    """
+    digits = value[0:2] + value[3:5] + value[6:]
+    if (
+        len(value) == 10
+        and value[2] == value[5] == "."
+        and digits.isascii()
+        and digits.isdigit()
+    ):
+        return datetime(int(value[6:]), int(value[3:5]), int(value[0:2]))
+    return datetime.strptime(value, "%d.%m.%Y")
+
+
+def _birthday_in(year: int, month: int, day: int) -> date:
+    """Date of a birthday in a given year; 29.02 falls on 28.02 in common years."""
+    if month == 2 and day == 29 and not isleap(year):
+        day = 28
+    return date(year, month, day)
+
+
+def _compute_congrats(
+    month: int, day: int, today_ord: int, year: int
+) -> tuple[int, int, bool] | None:
+    """
+    Find the congratulation date for a birthday within the next 7 days.
+
+    Works on day ordinals only, so it is plain integer arithmetic.
+    A birthday already past this year is looked up in the next one, and
+    birthdays on a weekend are moved to the following Monday.
+
+    Args:
+        month (int): Birthday month.
+        day (int): Birthday day of month.
+        today_ord (int): Ordinal of today's date.
+        year (int): Current year.
+
+    Returns:
+        tuple[int, int, bool] | None: (congratulation date ordinal, year of the
+            birthday, whether that date differs from the birthday's own day and
+            month), or None if the birthday is not within 7 days.
+    """
+    SATURDAY = 5
+    bday = _birthday_in(year, month, day)
+    if bday.toordinal() < today_ord:
+        year += 1
+        bday = _birthday_in(year, month, day)
+
+    ordinal = bday.toordinal()
+    if ordinal - today_ord > 7:
+        return None
+    # Ordinal 1 (0001-01-01) is a Monday, so this matches date.weekday()
+    weekday = (ordinal + 6) % 7
+    # Branchless weekend shift: adds 2 on Saturday, 1 on Sunday, else 0
+    shift = (7 - weekday) * (weekday >= SATURDAY)
+    return ordinal + shift, year, shift > 0 or bday.day != day
 
 
 class Field:
     """Base class for all fields in a contact record."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         """Initialize a field with a given value."""
         self.value = value
@@ -25,12 +117,24 @@ class Field:
         Returns:
             str: Formatted string representation of the field value.
         """
-        return format(str(self.value), format_spec)
+        value = self.value
+        # String values (Name, Phone) skip the str() round-trip
+        return format(value if type(value) is str else str(value), format_spec)
+
+    def __setstate__(self, state):
+        # Slotted pickles carry (None, slots); those written before __slots__
+        # was added carry a plain __dict__
+        if isinstance(state, tuple):
+            state = state[1]
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
 
 class Name(Field):
     """Class representing a contact's name."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         """
         Initialize a Name instance.
@@ -56,6 +160,8 @@ class Name(Field):
 class Phone(Field):
     """Class representing a phone number."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         """
         Initialize a Phone instance with validation.
@@ -69,9 +175,11 @@ class Phone(Field):
         """
         if not isinstance(value, str):
             raise TypeError("Phone number must be a string")
-        if not value.isdigit() or len(value) != 10:
+        if not _is_phone(value):
             raise ValueError("Phone number must contain exactly 10 digits")
-        super().__init__(value)
+        # Interned so equal numbers across contacts share one string;
+        # str() first, as sys.intern() rejects str subclasses
+        super().__init__(sys.intern(str(value)))
 
     def __eq__(self, other) -> bool:
         """Compare two Phone objects by their value."""
@@ -81,6 +189,12 @@ class Phone(Field):
 class Birthday(Field):
     """Class representing a birthday date."""
 
+    __slots__ = ("_value", "_mmdd")
+
+    # Bumped when an existing birthday's value is reassigned, so address books
+    # can tell that a memoized get_upcoming_birthdays result is outdated
+    _edits = 0
+
     def __init__(self, value: str | datetime):
         """
         Initialize a Birthday instance.
@@ -94,23 +208,38 @@ class Birthday(Field):
         """
 
         if isinstance(value, datetime):
-            self.value = value
-            return
-
-        if not isinstance(value, str):
+            self._store(value)
+        elif not isinstance(value, str):
             raise TypeError(
                 "Birthday number must be a string in 'DD.MM.YYYY' format or datetime"
             )
+        else:
+            try:
+                self._store(_parse_bday(value))
+            except ValueError as e:
+                raise ValueError("Invalid date format. Use DD.MM.YYYY") from e
 
-        try:
-            self.value = datetime.strptime(value, "%d.%m.%Y")
-        except ValueError as e:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY") from e
+    @property
+    def value(self) -> datetime:
+        """The birthday date."""
+        return self._value
+
+    @value.setter
+    def value(self, value: datetime) -> None:
+        self._store(value)
+        Birthday._edits += 1
+
+    def _store(self, value: datetime) -> None:
+        self._value = value
+        # 'MM.DD' of the date, joined with a year when it is congratulated
+        self._mmdd = f"{value.month:02d}.{value.day:02d}"
 
 
 class Record:
     """Class representing a single contact record."""
 
+    __slots__ = ("name", "_phones", "birthday")
+
     def __init__(self, name: str):
         """
         Initialize a record with a name and optional list of phone numbers.
@@ -122,7 +251,7 @@ class Record:
             ValueError: If the name is invalid.
         """
         self.name: Name = Name(name)
-        self.phones: list[Phone] = []
+        self._phones: dict[str, Phone] = {}
         self.birthday: Birthday | None = None
 
     def add_birthday(self, bday: str | Birthday) -> None:
@@ -135,11 +264,16 @@ class Record:
         Raises:
             ValueError: If birthday already exists for this contact.
         """
-        if self.birthday:
+        if self.birthday is not None:
             raise ValueError("Birthday already exists")
 
         self.birthday = Birthday(bday)
 
+    @property
+    def phones(self) -> list[Phone]:
+        """List of the contact's phone numbers in insertion order."""
+        return list(self._phones.values())
+
     def add_phone(self, phone: str) -> None:
         """
         Add a new phone number to the contact.
@@ -151,9 +285,9 @@ class Record:
             ValueError: If the phone is invalid or already exists.
         """
         new_phone = Phone(phone)
-        if new_phone in self.phones:
+        if phone in self._phones:
             raise ValueError("Phone already exists")
-        self.phones.append(new_phone)
+        self._phones[new_phone.value] = new_phone
 
     def remove_phone(self, phone: str) -> None:
         """
@@ -166,8 +300,8 @@ class Record:
             ValueError: If the phone is not found.
         """
         try:
-            self.phones.remove(Phone(phone))
-        except ValueError:
+            del self._phones[phone]
+        except KeyError:
             raise ValueError("Phone not found")
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
@@ -181,15 +315,26 @@ class Record:
         Raises:
             ValueError: If the old phone does not exist or new one is invalid.
         """
-        if Phone(new_phone) in self.phones:
+        phone = Phone(new_phone)
+        phones = self._phones
+        if new_phone in phones:
             raise ValueError("New phone already exists")
-
-        try:
-            index = self.phones.index(Phone(old_phone))
-            self.phones[index] = Phone(new_phone)
-        except ValueError:
+        if old_phone not in phones:
             raise ValueError(f"Phone '{old_phone}' not found")
 
+        if next(reversed(phones)) == old_phone:
+            # Last phone (e.g. the only one): re-inserting keeps the order
+            del phones[old_phone]
+            phones[phone.value] = phone
+            return
+
+        # Rebuild the mapping so the edited phone keeps its position
+        self._phones = {}
+        for key, p in phones.items():
+            if key == old_phone:
+                key, p = phone.value, phone
+            self._phones[key] = p
+
     def find_phone(self, phone: str) -> Phone | None:
         """
         Find a phone number in the contact.
@@ -200,19 +345,34 @@ class Record:
         Returns:
             Phone | None: Found Phone object or None if not found.
         """
-        for p in self.phones:
-            if p.value == phone:
-                return p
-        return None
+        return self._phones.get(phone)
 
     def __str__(self):
-        phones_str = "; ".join(p.value for p in self.phones) or "No phones"
+        # Keys are the phone numbers themselves, in insertion order
+        phones_str = "; ".join(self._phones) or "No phones"
         return f"Contact name: {self.name.value}, phones: {phones_str}"
 
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        # Records pickled before phones were indexed by number keep a list
+        if "phones" in state:
+            state = dict(state)
+            state["_phones"] = {p.value: p for p in state.pop("phones")}
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
-class AddressBook(UserDict):
+
+class AddressBook(dict):
     """Class representing an address book for managing contact records."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Memoized get_upcoming_birthdays result and the state it was built for
+        self._upcoming_key: tuple | None = None
+        self._upcoming: list[dict[str, str]] = []
+
     def add_record(self, record: Record) -> None:
         """
         Add a new record to the address book.
@@ -226,9 +386,37 @@ class AddressBook(UserDict):
         """
         if not isinstance(record, Record):
             raise TypeError("Argument must be a Record instance")
-        if record.name.value in self.data:
+        if record.name.value in self:
             raise ValueError(f"Record with name '{record.name.value}' already exists")
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+
+    def add_records(self, records: Iterable[Record]) -> None:
+        """
+        Add several records to the address book at once.
+
+        Either all records are added or, if any of them is rejected, none.
+
+        Args:
+            records (Iterable[Record]): The contact records to add.
+
+        Raises:
+            TypeError: If an item is not a Record instance.
+            ValueError: If a name is repeated or a record with it already exists.
+        """
+        new = {}
+        for record in records:
+            if not isinstance(record, Record):
+                raise TypeError("Argument must be a Record instance")
+            if record.name.value in new:
+                raise ValueError(f"Record with name '{record.name.value}' is repeated")
+            new[record.name.value] = record
+
+        existing = new.keys() & self.keys()
+        if existing:
+            names = ", ".join(f"'{name}'" for name in sorted(existing))
+            raise ValueError(f"Records with names {names} already exist")
+
+        self.update(new)
 
     def find(self, name: str) -> Record | None:
         """
@@ -240,7 +428,7 @@ class AddressBook(UserDict):
         Returns:
             Record | None: Found record or None if not found.
         """
-        return self.data.get(name)
+        return self.get(name)
 
     def delete(self, name: str) -> None:
         """
@@ -252,9 +440,39 @@ class AddressBook(UserDict):
         Raises:
             KeyError: If the contact does not exist.
         """
-        if name not in self.data:
+        if name not in self:
             raise KeyError(f"Contact '{name}' not found")
-        del self.data[name]
+        del self[name]
+
+    def copy(self) -> "AddressBook":
+        """Return a shallow copy as an AddressBook."""
+        return type(self)(self)
+
+    # dict's | returns a plain dict; keep returning an AddressBook as the
+    # UserDict-based version did
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        book = self.copy()
+        book.update(other)
+        return book
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        book = type(self)(other)
+        book.update(self)
+        return book
+
+    def __reduce__(self):
+        # Copies and pickles are rebuilt through __init__, so they never carry
+        # over the memoized get_upcoming_birthdays result
+        return type(self), (dict(self),)
+
+    def __setstate__(self, state):
+        # Whole-book pickles written by the former UserDict-based AddressBook
+        AddressBook.__init__(self, state.get("data", {}))
 
     def get_upcoming_birthdays(self) -> list[dict[str:Record]]:
         """
@@ -267,51 +485,50 @@ class AddressBook(UserDict):
             list[dict]: List of dictionaries with 'name' and 'congratulation_date' keys.
                        Empty list if no upcoming birthdays or no contacts.
         """
-        if not len(self.data):
+        if not self:
             return []
 
         today = datetime.today().date()
+        # The result only depends on the date and on which birthday object each
+        # name maps to. Snapshotting those pairs runs entirely in C, so it is
+        # far cheaper than the date arithmetic and catches any change to the
+        # book, including plain dict operations like del book[name].
+        key = (
+            today.toordinal(),
+            Birthday._edits,
+            tuple(zip(self, map(_birthday_of, self.values()))),
+        )
+        if key != self._upcoming_key:
+            self._upcoming = self._compute_upcoming(today)
+            self._upcoming_key = key
+        # Copies, so callers cannot alter the memoized result
+        return [dict(item) for item in self._upcoming]
+
+    def _compute_upcoming(self, today: date) -> list[dict[str, str]]:
+        """Compute get_upcoming_birthdays entries in one pass over the records."""
+        today_ord, year = today.toordinal(), today.year
 
-        bdays: list[datetime | None] = [
-            record.birthday.value.date().replace(year=today.year)
-            for record in self.data.values()
-        ]
-
-        congrat_dates = [
-            (
-                bday
-                if (bday - today) >= timedelta(days=0)
-                and (bday - today) <= timedelta(days=7)
-                else None
-            )
-            for bday in bdays
-        ]
-
-        SATURDAY = 5
-        congrat_dates = [
-            (
-                date + timedelta(days=7 - date.weekday())
-                if date and date.weekday() >= SATURDAY
-                else date
+        ret = []
+        for name, record in self.items():
+            bday = record.birthday
+            if bday is None:
+                continue
+            congrat = _compute_congrats(
+                bday.value.month, bday.value.day, today_ord, year
             )
-            for date in congrat_dates
-        ]
+            if congrat is None:
+                continue
 
-        ret = []
-        for username, date in zip(self.data.keys(), congrat_dates):
-            if date:
-                ret.append(
-                    {
-                        "name": username,
-                        "congratulation_date": date.strftime("%Y.%m.%d"),
-                    }
-                )
+            ordinal, bday_year, moved = congrat
+            if moved:
+                day = date.fromordinal(ordinal)
+                congrat_date = f"{day.year}.{day.month:02d}.{day.day:02d}"
+            else:
+                congrat_date = f"{bday_year}.{bday._mmdd}"
+            ret.append({"name": name, "congratulation_date": congrat_date})
 
         return ret
 
-    def __iter__(self):
-        return super().__iter__()
-
 
 class AddressBookStorage:
     """Class responsible for saving and loading AddressBook data."""
@@ -329,11 +546,103 @@ class AddressBookStorage:
         """
         Save address book to file using pickle.
 
+        Records are pickled one after another behind a header holding
+        their count, so they can be read back one at a time. The data is
+        written to a temporary file first and then atomically moved over
+        the old one, so a failed save never leaves a corrupted file behind.
+
         Args:
             book (AddressBook): Address book instance to save.
         """
-        with open(self.filename, "wb") as f:
-            dump(book, f)
+        # Imported here so working with records alone does not load pickle
+        from pickle import dump
+
+        tmp_filename = f"{self.filename}.tmp"
+        try:
+            with open(tmp_filename, "wb", buffering=BUFFER_SIZE) as f:
+                f.write(FILE_HEADER.pack(FILE_MAGIC, len(book)))
+                for record in book.values():
+                    dump(record, f, protocol=PICKLE_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, self.filename)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_filename)
+            raise
+
+    def iter_records(self) -> Iterator[Record]:
+        """
+        Lazily read records from file one at a time.
+
+        A file written in the old whole-book pickle format is read in full
+        before its records are yielded. It is left as is and only takes the
+        current format on the next save.
+
+        Yields:
+            Record: Next stored record. Nothing is yielded if file not found.
+
+        Raises:
+            ValueError: If the file is not in address book storage format.
+        """
+        try:
+            f = open(self.filename, "rb", buffering=BUFFER_SIZE)
+        except FileNotFoundError:
+            return
+
+        with f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) == FILE_HEADER.size:
+                magic, count = FILE_HEADER.unpack(header)
+                if magic == FILE_MAGIC:
+                    for _ in range(count):
+                        yield self._load(f, Record)
+                    return
+
+            f.seek(0)
+            book = self._load(f, AddressBook)
+
+        yield from book.values()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _unpickler() -> type:
+        """
+        Build the unpickler class that resolves stored classes to this module.
+
+        Files saved by running this file as a script refer to __main__ and
+        those saved by code importing it refer to models; either way the
+        classes are taken from this module as it is loaded now.
+        """
+        from pickle import Unpickler
+
+        module = sys.modules[__name__]
+
+        class StorageUnpickler(Unpickler):
+            def find_class(self, module_name, name):
+                if module_name in STORED_MODULES and name in STORED_CLASSES:
+                    return getattr(module, name)
+                return super().find_class(module_name, name)
+
+        return StorageUnpickler
+
+    @classmethod
+    def _load(cls, f, expected: type):
+        """
+        Read the next pickled object, which must be an instance of expected.
+
+        Raises:
+            ValueError: If the data is not such a pickle or is truncated.
+        """
+        # One unpickler per pickle: protocol 4+ memo indices restart with
+        # every dump and would clash with those left from the previous one
+        try:
+            obj = cls._unpickler()(f).load()
+        except Exception as e:
+            raise ValueError("Unsupported address book file format") from e
+        if not isinstance(obj, expected):
+            raise ValueError("Unsupported address book file format")
+        return obj
 
     def load(self) -> AddressBook:
         """
@@ -342,11 +651,10 @@ class AddressBookStorage:
         Returns:
             AddressBook: Loaded address book or new empty one if file not found.
         """
-        try:
-            with open(self.filename, "rb") as f:
-                return load(f)
-        except FileNotFoundError:
-            return AddressBook()  # Return new empty address book
+        book = AddressBook()
+        for record in self.iter_records():
+            book.add_record(record)
+        return book
 
 
 # Tests
@@ -367,14 +675,23 @@ def make_record(name: str, phones=None, birthday=""):
 
 def main():
     storage = AddressBookStorage()
-    book = storage.load()
+    book = AddressBook()
 
-    for key in book:
-        print(book[key])
     try:
-        book.add_record(make_record("Jack", ["5554446464"], "05.10.2001"))
-        book.add_record(make_record("John", ["1234567890", "5555555555"], "14.10.2004"))
-        book.add_record(make_record("Roman", ["3334445566"], "20.09.2000"))
+        for record in storage.iter_records():
+            print(record)
+            book.add_record(record)
+    except ValueError as e:
+        print(f"Could not load '{storage.filename}': {e}")
+        return
+    try:
+        book.add_records(
+            [
+                make_record("Jack", ["5554446464"], "05.10.2001"),
+                make_record("John", ["1234567890", "5555555555"], "14.10.2004"),
+                make_record("Roman", ["3334445566"], "20.09.2000"),
+            ]
+        )
     except ValueError:
         print("Users already exist")
 
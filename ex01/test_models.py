@@ -0,0 +1,191 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from models import AddressBook, AddressBookStorage, Birthday, make_record
+
+TESTDATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata")
+
+
+class UpcomingBirthdaysTest(unittest.TestCase):
+    """get_upcoming_birthdays must follow every way the book can change."""
+
+    def setUp(self):
+        self.today = datetime.today().strftime("%d.%m.%Y")
+        self.book = AddressBook()
+        self.book.add_records(
+            [make_record(name, birthday=self.today) for name in ("A", "B")]
+        )
+        # Builds the birthday columns and memoizes the result
+        self.assertEqual(self.upcoming(), ["A", "B"])
+
+    def upcoming(self, book=None):
+        book = self.book if book is None else book
+        return sorted(item["name"] for item in book.get_upcoming_birthdays())
+
+    def test_del_item(self):
+        del self.book["A"]
+        self.assertEqual(self.upcoming(), ["B"])
+
+    def test_pop(self):
+        self.book.pop("B")
+        self.assertEqual(self.upcoming(), ["A"])
+
+    def test_set_item_and_update(self):
+        self.book["C"] = make_record("C", birthday=self.today)
+        self.book.update(Q=make_record("Q", birthday=self.today))
+        self.assertEqual(self.upcoming(), ["A", "B", "C", "Q"])
+
+    def test_birthday_assignment(self):
+        record = make_record("C")
+        self.book.add_record(record)
+        self.assertEqual(self.upcoming(), ["A", "B"])
+        record.birthday = Birthday(self.today)
+        self.assertEqual(self.upcoming(), ["A", "B", "C"])
+
+    def test_birthday_value_edited_in_place(self):
+        self.book["A"].birthday.value = datetime(2000, 1, 1)
+        self.book["A"].birthday.value = datetime.today()
+        self.book["B"].birthday.value = datetime(2000, 1, 1)
+        self.assertEqual(self.upcoming(), ["A"])
+
+    def test_record_in_two_books(self):
+        record = make_record("C")
+        self.book.add_record(record)
+        other = AddressBook()
+        other.add_record(record)
+        record.add_birthday(self.today)
+        self.assertEqual(self.upcoming(), ["A", "B", "C"])
+        self.assertEqual(self.upcoming(other), ["C"])
+
+
+def frozen_today(year, month, day):
+    """Patch models.datetime so that today() returns the given date."""
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def today(cls):
+            return cls(year, month, day)
+
+    return mock.patch("models.datetime", FrozenDatetime)
+
+
+class CongratulationDateTest(unittest.TestCase):
+    """Congratulation dates around 29.02, weekends and the new year."""
+
+    def congrats(self, today, birthday):
+        book = AddressBook()
+        book.add_record(make_record("A", birthday=birthday))
+        with frozen_today(*today):
+            return [item["congratulation_date"]
+                    for item in book.get_upcoming_birthdays()]
+
+    def test_leap_day_in_leap_year(self):
+        self.assertEqual(self.congrats((2028, 2, 27), "29.02.2000"),
+                         ["2028.02.29"])
+
+    def test_leap_day_in_common_year(self):
+        self.assertEqual(self.congrats((2025, 2, 25), "29.02.2000"),
+                         ["2025.02.28"])
+        # 28.02.2026 is a Saturday
+        self.assertEqual(self.congrats((2026, 2, 26), "29.02.2000"),
+                         ["2026.03.02"])
+
+    def test_next_year(self):
+        self.assertEqual(self.congrats((2026, 12, 29), "01.01.1990"),
+                         ["2027.01.01"])
+        # 02.01.2027 is a Saturday
+        self.assertEqual(self.congrats((2026, 12, 29), "02.01.1990"),
+                         ["2027.01.04"])
+
+    def test_past_birthday(self):
+        self.assertEqual(self.congrats((2026, 3, 10), "09.03.1990"), [])
+
+
+class AddressBookMappingTest(unittest.TestCase):
+    def test_union_returns_address_book(self):
+        book = AddressBook(A=make_record("A"))
+        other = {"B": make_record("B")}
+        for merged in (book | other, other | book, book.copy()):
+            self.assertIs(type(merged), AddressBook)
+        self.assertEqual(list(book | other), ["A", "B"])
+        self.assertEqual(list(other | book), ["B", "A"])
+        book |= other
+        self.assertIs(type(book), AddressBook)
+        self.assertEqual(list(book), ["A", "B"])
+
+
+
+class AddressBookStorageTest(unittest.TestCase):
+    """Saved books load back whichever way this module was run."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+        self.storage = AddressBookStorage(
+            os.path.join(self.tmpdir, "addressbook.pkl")
+        )
+
+    def read(self):
+        with open(self.storage.filename, "rb") as f:
+            return f.read()
+
+    def test_round_trip(self):
+        book = AddressBook()
+        book.add_records([
+            make_record("Jack", ["5554446464"], "05.10.2001"),
+            make_record("John", ["1234567890", "5555555555"]),
+        ])
+        self.storage.save(book)
+        loaded = self.storage.load()
+        self.assertIs(type(loaded), AddressBook)
+        self.assertEqual([str(r) for r in loaded.values()],
+                         [str(r) for r in book.values()])
+        self.assertEqual(loaded["Jack"].birthday.value,
+                         book["Jack"].birthday.value)
+
+    def test_saved_by_script(self):
+        # Run as a script, the module pickles its classes as __main__
+        subprocess.run(
+            [sys.executable, os.path.join(os.path.dirname(TESTDATA), "models.py")],
+            cwd=self.tmpdir, check=True, capture_output=True,
+        )
+        self.assertEqual(list(self.storage.load()), ["Jack", "John", "Roman"])
+
+    def test_truncated_file(self):
+        book = AddressBook(A=make_record("A", ["1234567890"]))
+        self.storage.save(book)
+        data = self.read()
+        with open(self.storage.filename, "wb") as f:
+            f.write(data[:-3])
+        with self.assertRaises(ValueError):
+            self.storage.load()
+
+    def test_unknown_format(self):
+        with open(self.storage.filename, "wb") as f:
+            f.write(b"not an address book")
+        with self.assertRaises(ValueError):
+            self.storage.load()
+
+    def test_legacy_file_migrated_on_save(self):
+        # Written by the former whole-book format, run as a script
+        shutil.copy(os.path.join(TESTDATA, "legacy.pkl"), self.storage.filename)
+        legacy = self.read()
+        book = self.storage.load()
+        self.assertEqual(list(book), ["Jack", "John", "Roman"])
+        self.assertEqual(book["John"].find_phone("5555555555").value,
+                         "5555555555")
+        self.assertEqual(self.read(), legacy)
+
+        self.storage.save(book)
+        self.assertTrue(self.read().startswith(b"ABK1"))
+        self.assertEqual(list(self.storage.load()), ["Jack", "John", "Roman"])
+
+if __name__ == "__main__":
+    unittest.main()